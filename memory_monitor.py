@@ -2,28 +2,54 @@
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, GLib, Gdk, Pango
+import argparse
 import subprocess
 import threading
 import time
 from datetime import datetime
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+
+from monitor_config import ConfigError, ConfigWatcher, load_config
+from monitor_history import (ReplayPlayer, Sample, SampleRecorder, check_thresholds,
+                             export_samples, history_capacity, import_samples)
+from monitor_notifiers import (EmailNotifier, NotificationQueue, alert_notification, build_notifiers,
+                               make_notification, scheduled_report_notification)
+from monitor_stats import REPORT_PERIODS, ReportScheduler
 
 class MemoryCpuMonitorWindow(Gtk.Window):
-    def __init__(self):
-        Gtk.Window.__init__(self, title="Memory & CPU Monitor")
+    def __init__(self, config_path=None, replay_samples=None, replay_speed=60.0):
+        title = "Memory & CPU Monitor"
+        if replay_samples is not None:
+            title += " (Replay)"
+        Gtk.Window.__init__(self, title=title)
         self.set_border_width(10)
         self.set_default_size(500, 450)
 
-        # Default settings
-        self.memory_alert_threshold = 90
-        self.cpu_alert_threshold = 80
-        self.email_recipient = "test@gmail.com"
+        # Settings come from the config file; a missing file means the defaults,
+        # an invalid one raises ConfigError rather than silently using them
+        self.config = load_config(config_path)
+        self.memory_alert_threshold = self.config.memory_threshold
+        self.cpu_alert_threshold = self.config.cpu_threshold
+        self.email_recipient = self.config.email_recipient
         self.is_monitoring = False
-        self.monitoring_interval = 60  # seconds
+        self.monitoring_interval = self.config.interval  # seconds
+        self.interval_changed = threading.Event()  # wakes the monitoring thread early
         self.cpu_history = []  # Store CPU history as (timestamp, percent)
-        self.history_max = 20  # Maximum number of history points to store
+        self.history_max = self.config.history_max  # Maximum number of history points to store
+
+        # Every live sample is recorded for export; in replay mode samples come
+        # from a recording instead of /proc and alerts are logged, not emailed
+        self.recorder = SampleRecorder(history_capacity(self.config.record_max,
+                                                        self.config.history_budget_kb))
+        self.replay = None
+        self.replay_alert_count = 0
+        if replay_samples is not None:
+            self.replay = ReplayPlayer(replay_samples, speed=replay_speed)
+
+        # Summary statistics for the current report period, updated per sample
+        self.report_lock = threading.Lock()
+        self.report_schedule_enabled = self.config.report_schedule != "off"
+        period = self.config.report_schedule if self.report_schedule_enabled else "daily"
+        self.report_scheduler = ReportScheduler(period, self.monitoring_interval)
 
         # CSS styling
         css_provider = Gtk.CssProvider()
@@ -41,9 +67,26 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         # Create main layout
         self.create_ui()
 
+        # Alerts go out through a bounded queue so delivery never blocks sampling
+        self.notifications = NotificationQueue(
+            self.build_notifiers(self.config),
+            max_pending=self.config.notify_queue_size,
+            max_retries=self.config.notify_max_retries,
+            on_result=lambda notifier, batch, error: GLib.idle_add(
+                self.on_notification_result, notifier, batch, error)
+        )
+
         # Initial memory & CPU check
         self.check_memory_cpu_once()
 
+        # Apply config file changes live, without touching the sampler or history
+        self.config_watcher = ConfigWatcher(
+            config_path,
+            lambda config: GLib.idle_add(self.apply_config, config),
+            current=self.config
+        )
+        self.config_watcher.start()
+
     def create_ui(self):
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         self.add(main_box)
@@ -197,22 +240,29 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         self.email_entry = Gtk.Entry()
         self.email_entry.set_text(self.email_recipient)
         self.email_entry.connect("changed", self.on_email_changed)
+        self.email_entry.connect("focus-out-event", self.on_email_settings_changed)
         email_entry_box.pack_start(self.email_entry, True, True, 0)
 
         sender_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
         email_box.pack_start(sender_box, False, False, 0)
         sender_box.pack_start(Gtk.Label(label="Sender Email:"), False, False, 0)
         self.sender_entry = Gtk.Entry()
-        self.sender_entry.set_text("ketansayal04@gmail.com")
+        self.sender_entry.set_text(self.config.sender_email)
+        self.sender_entry.connect("focus-out-event", self.on_email_settings_changed)
         sender_box.pack_start(self.sender_entry, True, True, 0)
 
+        # The app password is never typed in; it comes from a file or env var
         password_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
         email_box.pack_start(password_box, False, False, 0)
         password_box.pack_start(Gtk.Label(label="App Password:"), False, False, 0)
-        self.password_entry = Gtk.Entry()
-        self.password_entry.set_visibility(False)
-        self.password_entry.set_text("yoxu jkte qebl afzf")
-        password_box.pack_start(self.password_entry, True, True, 0)
+        self.password_source_label = Gtk.Label()
+        self.password_source_label.set_text(self.describe_password_source())
+        password_box.pack_start(self.password_source_label, False, False, 0)
+
+        config_label = Gtk.Label()
+        config_label.set_text(f"Config file: {self.config.path}")
+        config_label.set_line_wrap(True)
+        email_box.pack_start(config_label, False, False, 0)
 
         # Monitor settings
         monitor_frame = Gtk.Frame(label="Monitoring Settings")
@@ -313,6 +363,8 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         schedule_frame.add(schedule_box)
         
         self.schedule_check = Gtk.CheckButton(label="Send periodic reports")
+        self.schedule_check.set_active(self.report_schedule_enabled)
+        self.schedule_check.connect("toggled", self.on_schedule_toggled)
         schedule_box.pack_start(self.schedule_check, False, False, 0)
         
         frequency_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
@@ -321,11 +373,42 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         frequency_box.pack_start(Gtk.Label(label="Frequency:"), False, False, 0)
         
         self.frequency_combo = Gtk.ComboBoxText()
-        self.frequency_combo.append_text("Hourly")
-        self.frequency_combo.append_text("Daily")
-        self.frequency_combo.append_text("Weekly")
-        self.frequency_combo.set_active(1)  # Default to daily
+        self.frequency_combo.append("hourly", "Hourly")
+        self.frequency_combo.append("daily", "Daily")
+        self.frequency_combo.append("weekly", "Weekly")
+        self.frequency_combo.set_active_id(self.report_scheduler.period)
+        self.frequency_combo.connect("changed", self.on_frequency_changed)
         frequency_box.pack_start(self.frequency_combo, True, True, 0)
+
+        # Export recorded history for offline analysis / replay
+        export_frame = Gtk.Frame(label="Export History")
+        reports_box.pack_start(export_frame, False, False, 10)
+
+        export_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        export_box.set_border_width(10)
+        export_frame.add(export_box)
+
+        range_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        export_box.pack_start(range_box, False, False, 0)
+        range_box.pack_start(Gtk.Label(label="Last:"), False, False, 0)
+        range_adjustment = Gtk.Adjustment(value=24, lower=0, upper=720, step_increment=1)
+        self.export_hours_spin = Gtk.SpinButton()
+        self.export_hours_spin.set_adjustment(range_adjustment)
+        range_box.pack_start(self.export_hours_spin, False, False, 0)
+        range_box.pack_start(Gtk.Label(label="hours (0 = everything)"), False, False, 0)
+
+        format_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        export_box.pack_start(format_box, False, False, 0)
+        format_box.pack_start(Gtk.Label(label="Format:"), False, False, 0)
+        self.export_format_combo = Gtk.ComboBoxText()
+        self.export_format_combo.append(".csv.gz", "Compressed CSV")
+        self.export_format_combo.append(".parquet", "Parquet")
+        self.export_format_combo.set_active(0)
+        format_box.pack_start(self.export_format_combo, True, True, 0)
+
+        export_button = Gtk.Button(label="Export...")
+        export_button.connect("clicked", self.on_export_clicked)
+        format_box.pack_end(export_button, False, False, 0)
         
         return reports_box
 
@@ -358,18 +441,20 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             load_avg = float(subprocess.check_output(cmd, shell=True, text=True).strip())
             
             # Add to history
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.cpu_history.append((timestamp, cpu_percent))
-            
-            # Keep only the latest history_max entries
-            while len(self.cpu_history) > self.history_max:
-                self.cpu_history.pop(0)
+            self.add_cpu_history(datetime.now(), cpu_percent)
                 
             return cpu_percent, cpu_count, load_avg
         except Exception as e:
             print(f"Error getting CPU usage: {e}")
             return 0, 0, 0.0
             
+    def add_cpu_history(self, when, cpu_percent):
+        self.cpu_history.append((when.strftime("%H:%M:%S"), cpu_percent))
+
+        # Keep only the latest history_max entries
+        while len(self.cpu_history) > self.history_max:
+            self.cpu_history.pop(0)
+
     def get_system_info(self):
         try:
             # Get OS information
@@ -408,8 +493,12 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             return
             
         buffer = self.cpu_history_view.get_buffer()
-        buffer.set_text("")
-        
+        graph_text = self.render_cpu_history_graph(self.cpu_history)
+        buffer.set_text(graph_text)
+        return graph_text
+
+    def render_cpu_history_graph(self, cpu_history):
+        """Draw an ASCII graph of (timestamp, percent) points"""
         # Create ASCII graph
         graph_height = 10  # rows for the graph
         graph_text = "CPU Usage History:\n"
@@ -425,7 +514,7 @@ class MemoryCpuMonitorWindow(Gtk.Window):
                 graph_text += f"{y_value:3d}% │"
                 
             # Add data points
-            for timestamp, value in self.cpu_history:
+            for timestamp, value in cpu_history:
                 scaled_value = (value / 100) * graph_height
                 if round(scaled_value) == i:
                     graph_text += "●"
@@ -438,7 +527,7 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             
         # Add x-axis
         graph_text += "     "
-        for i in range(len(self.cpu_history)):
+        for i in range(len(cpu_history)):
             if i % 5 == 0:  # Show timestamp every 5 points
                 graph_text += "┴"
             else:
@@ -447,34 +536,78 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         
         # Add timestamp labels
         graph_text += "     "
-        for i in range(len(self.cpu_history)):
+        for i in range(len(cpu_history)):
             if i % 5 == 0:  # Show timestamp every 5 points
-                graph_text += self.cpu_history[i][0][3:5]  # Minutes
+                graph_text += cpu_history[i][0][3:5]  # Minutes
             else:
                 graph_text += "  "
                 
-        buffer.set_text(graph_text)
         return graph_text
 
     def check_memory_cpu_once(self):
+        if self.replay is not None:
+            # Show the sample the replay is at; its alerts are counted when it is played
+            if self.replay.current is not None:
+                self.process_sample(self.replay.current, alerts=False)
+            return True
+
         # Get memory stats
         mem_percent, total_mem, used_mem, free_mem = self.get_memory_usage()
         
         # Get CPU stats
         cpu_percent, cpu_count, load_avg = self.get_cpu_usage()
-        
+
+        sample = Sample(time.time(), mem_percent, total_mem, used_mem, free_mem,
+                        cpu_percent, cpu_count, load_avg)
+        self.recorder.record(sample)
+        self.aggregate_sample(sample)
+        self.process_sample(sample)
+            
+        return True
+
+    def process_sample(self, sample, alerts=True):
+        """Update the UI and, if alerts is set, run the alert logic for a live or replayed sample"""
         # Update UI
-        GLib.idle_add(self.update_memory_ui, mem_percent, total_mem, used_mem, free_mem)
-        GLib.idle_add(self.update_cpu_ui, cpu_percent, cpu_count, load_avg)
+        GLib.idle_add(self.update_memory_ui, sample.mem_percent, sample.total_mem,
+                      sample.used_mem, sample.free_mem)
+        GLib.idle_add(self.update_cpu_ui, sample.cpu_percent, sample.cpu_count, sample.load_avg)
         
         # Check for alerts
-        if mem_percent >= self.memory_alert_threshold:
-            GLib.idle_add(self.send_alert, "Memory", mem_percent, self.memory_alert_threshold)
-            
-        if cpu_percent >= self.cpu_alert_threshold:
-            GLib.idle_add(self.send_alert, "CPU", cpu_percent, self.cpu_alert_threshold)
-            
-        return True
+        if not alerts:
+            return
+        alert = self.send_alert if self.replay is None else self.log_replay_alert
+        for resource_type, percent_used, threshold in check_thresholds(
+                sample, self.memory_alert_threshold, self.cpu_alert_threshold):
+            GLib.idle_add(alert, resource_type, percent_used, threshold, sample.timestamp)
+
+    def aggregate_sample(self, sample):
+        """Fold a new sample into the report statistics, sending the report when a period ends"""
+        with self.report_lock:
+            finished = self.report_scheduler.add(
+                sample, self.memory_alert_threshold, self.cpu_alert_threshold,
+                track_processes=self.replay is None
+            )
+        if finished is not None and self.report_schedule_enabled:
+            self.send_scheduled_report(finished)
+
+    def send_scheduled_report(self, window):
+        """Queue the summary for a finished report period on every channel"""
+        notification = scheduled_report_notification(
+            window.period, window, recipient=self.config.report_recipient or self.email_recipient
+        )
+        if self.replay is not None:
+            print(f"[replay] {notification.subject}\n{notification.body}")
+            return
+        self.notifications.submit(notification)
+
+    def log_replay_alert(self, resource_type, percent_used, threshold, timestamp):
+        """Record an alert the replayed data would have raised"""
+        self.replay_alert_count += 1
+        when = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[replay] {when} {resource_type} alert: {percent_used:.1f}% >= {threshold}%")
+        self.update_status(f"Replay {when}: {resource_type} alert #{self.replay_alert_count} "
+                           f"({percent_used:.1f}% >= {threshold}%)")
+        return False
 
     def update_memory_ui(self, percent_used, total_mem, used_mem, free_mem):
         self.memory_progress_bar.set_fraction(percent_used / 100.0)
@@ -493,8 +626,9 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         else:
             style_context.add_class("normal")
             
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.update_status(f"Last updated: {current_time}")
+        if self.replay is None:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.update_status(f"Last updated: {current_time}")
 
     def update_cpu_ui(self, cpu_percent, cpu_count, load_avg):
         self.cpu_progress_bar.set_fraction(cpu_percent / 100.0)
@@ -516,45 +650,64 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         # Update CPU history graph
         self.update_cpu_history_graph()
 
-    def send_alert(self, resource_type, percent_used, threshold):
-        try:
-            sender_email = self.sender_entry.get_text()
-            app_password = self.password_entry.get_text()
-            receiver_email = self.email_recipient
+    def send_alert(self, resource_type, percent_used, threshold, timestamp=None):
+        notification = alert_notification(resource_type, percent_used, threshold,
+                                          recipient=self.email_recipient)
+        if self.notifications.submit(notification):
+            self.update_status(f"⚠️ {resource_type} alert queued for delivery")
+        else:
+            self.update_status("❌ Notification queue full, alert dropped")
 
-            subject = f"ALERT: {resource_type} usage at {percent_used:.1f}%"
-            body = f"⚠️ Your system {resource_type.lower()} usage is at {percent_used:.1f}%, which exceeds the threshold of {threshold}%."
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            message_type=Gtk.MessageType.WARNING,
+            buttons=Gtk.ButtonsType.OK,
+            text=f"{resource_type} Alert"
+        )
+        dialog.format_secondary_text(notification.body)
+        dialog.run()
+        dialog.destroy()
 
-            msg = MIMEMultipart()
-            msg["From"] = sender_email
-            msg["To"] = receiver_email
-            msg["Subject"] = subject
-            msg.attach(MIMEText(body, "plain"))
+    def on_notification_result(self, notifier, batch, error):
+        """Report the outcome of a delivery attempt made by the notification queue"""
+        if error is None:
+            self.update_status(f"✅ {len(batch)} notification(s) sent via {notifier.name}")
+        else:
+            self.update_status(f"❌ Failed to send {len(batch)} notification(s) via {notifier.name}")
+        return False
+            
+    def latest_sample(self):
+        """The sample the monitor is currently showing, taking one only if there is none"""
+        if self.replay is not None:
+            return self.replay.current
+        sample = self.recorder.latest()
+        if sample is None:
+            mem_percent, total_mem, used_mem, free_mem = self.get_memory_usage()
+            cpu_percent, cpu_count, load_avg = self.get_cpu_usage()
+            sample = Sample(time.time(), mem_percent, total_mem, used_mem, free_mem,
+                            cpu_percent, cpu_count, load_avg)
+        return sample
 
-            server = smtplib.SMTP("smtp.gmail.com", 587)
-            server.starttls()
-            server.login(sender_email, app_password)
-            server.send_message(msg)
-            server.quit()
+    def get_report_options(self):
+        """Read the report checkboxes; must run on the GTK thread"""
+        return {
+            "include_system_info": self.include_system_info_check.get_active(),
+            "include_memory": self.include_memory_check.get_active(),
+            "include_cpu": self.include_cpu_check.get_active(),
+            "include_history": self.include_history_check.get_active(),
+            "cpu_history": list(self.cpu_history),
+        }
 
-            self.update_status(f"✅ Email alert sent to {receiver_email}")
+    def generate_report(self, include_system_info=True, include_memory=True, include_cpu=True,
+                        include_history=True, cpu_history=()):
+        """Generate a comprehensive system resource report.
 
-            dialog = Gtk.MessageDialog(
-                transient_for=self,
-                message_type=Gtk.MessageType.WARNING,
-                buttons=Gtk.ButtonsType.OK,
-                text=f"{resource_type} Alert"
-            )
-            dialog.format_secondary_text(body)
-            dialog.run()
-            dialog.destroy()
-
-        except Exception as e:
-            print(f"❌ Failed to send email: {e}")
-            self.update_status("❌ Failed to send email")
-            
-    def generate_report(self):
-        """Generate a comprehensive system resource report"""
+        Safe to call off the GTK thread: widget state comes in as arguments
+        (see get_report_options) and the figures come from the latest sample
+        and the running statistics rather than from fresh measurements.
+        """
+        sample = self.latest_sample()
+        sampled_at = datetime.fromtimestamp(sample.timestamp).strftime('%Y-%m-%d %H:%M:%S')
         report = []
         report.append("=" * 50)
         report.append("SYSTEM RESOURCE REPORT")
@@ -563,7 +716,7 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         report.append("")
         
         # Add system info if selected
-        if self.include_system_info_check.get_active():
+        if include_system_info:
             system_info = self.get_system_info()
             report.append("-" * 50)
             report.append("SYSTEM INFORMATION")
@@ -575,11 +728,12 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             report.append("")
         
         # Add memory stats if selected
-        if self.include_memory_check.get_active():
-            mem_percent, total_mem, used_mem, free_mem = self.get_memory_usage()
+        if include_memory:
+            mem_percent, total_mem, used_mem, free_mem = sample.mem_percent, sample.total_mem, sample.used_mem, sample.free_mem
             report.append("-" * 50)
             report.append("MEMORY STATISTICS")
             report.append("-" * 50)
+            report.append(f"Sampled at: {sampled_at}")
             report.append(f"Memory Usage: {mem_percent}%")
             report.append(f"Total Memory: {total_mem} MB")
             report.append(f"Used Memory: {used_mem} MB")
@@ -589,11 +743,12 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             report.append("")
         
         # Add CPU stats if selected
-        if self.include_cpu_check.get_active():
-            cpu_percent, cpu_count, load_avg = self.get_cpu_usage()
+        if include_cpu:
+            cpu_percent, cpu_count, load_avg = sample.cpu_percent, sample.cpu_count, sample.load_avg
             report.append("-" * 50)
             report.append("CPU STATISTICS")
             report.append("-" * 50)
+            report.append(f"Sampled at: {sampled_at}")
             report.append(f"Current CPU Usage: {cpu_percent:.1f}%")
             report.append(f"CPU Cores: {cpu_count}")
             report.append(f"Load Average: {load_avg:.2f}")
@@ -601,17 +756,26 @@ class MemoryCpuMonitorWindow(Gtk.Window):
                 report.append(f"⚠️ ALERT: CPU usage exceeds threshold of {self.cpu_alert_threshold}%")
             report.append("")
         
+        # Add statistics for the current report period
+        with self.report_lock:
+            window = self.report_scheduler.window
+            summary = window.format(title="CURRENT PERIOD SUMMARY") if window is not None else None
+        if summary:
+            report.append(summary)
+            report.append("")
+
         # Add CPU history if selected
-        if self.include_history_check.get_active() and self.cpu_history:
+        graph_text = None
+        if include_history and cpu_history:
             report.append("-" * 50)
             report.append("CPU USAGE HISTORY")
             report.append("-" * 50)
-            for i, (timestamp, value) in enumerate(self.cpu_history):
+            for i, (timestamp, value) in enumerate(cpu_history):
                 report.append(f"{timestamp}: {value:.1f}%")
             report.append("")
             
             # Add ASCII graph
-            graph_text = self.update_cpu_history_graph()
+            graph_text = self.render_cpu_history_graph(cpu_history)
             # Add CPU graph to report if there is data
         if graph_text:
             report.append("ASCII CPU Usage Graph:")
@@ -641,26 +805,26 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             dialog.destroy()
             return
             
+        # On-demand reports go straight to the requested address by email.
+        # Building and sending them happens off the GTK thread.
+        notifier = EmailNotifier(self.config.smtp_host, self.config.smtp_port,
+                                 self.sender_entry.get_text(), self.config.smtp_password, email)
+        options = self.get_report_options()
+        self.update_status(f"Sending report to {email}...")
+        threading.Thread(target=self.send_report, args=(notifier, options), daemon=True).start()
+
+    def send_report(self, notifier, options):
         try:
-            sender_email = self.sender_entry.get_text()
-            app_password = self.password_entry.get_text()
-            receiver_email = email
-            
             subject = f"System Resource Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-            body = self.generate_report()
-            
-            msg = MIMEMultipart()
-            msg["From"] = sender_email
-            msg["To"] = receiver_email
-            msg["Subject"] = subject
-            msg.attach(MIMEText(body, "plain"))
-            
-            server = smtplib.SMTP("smtp.gmail.com", 587)
-            server.starttls()
-            server.login(sender_email, app_password)
-            server.send_message(msg)
-            server.quit()
-            
+            body = self.generate_report(**options)
+            notifier.deliver([make_notification("report", subject, body)])
+            GLib.idle_add(self.on_report_sent, notifier.recipient, None)
+        except Exception as e:
+            print(f"❌ Failed to send report: {e}")
+            GLib.idle_add(self.on_report_sent, notifier.recipient, e)
+
+    def on_report_sent(self, receiver_email, error):
+        if error is None:
             self.update_status(f"✅ Report sent to {receiver_email}")
             
             dialog = Gtk.MessageDialog(
@@ -673,8 +837,7 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             dialog.run()
             dialog.destroy()
             
-        except Exception as e:
-            print(f"❌ Failed to send report: {e}")
+        else:
             self.update_status("❌ Failed to send report")
             
             dialog = Gtk.MessageDialog(
@@ -683,10 +846,81 @@ class MemoryCpuMonitorWindow(Gtk.Window):
                 buttons=Gtk.ButtonsType.OK,
                 text="Failed to Send Report"
             )
-            dialog.format_secondary_text(f"Error: {str(e)}")
+            dialog.format_secondary_text(f"Error: {str(error)}")
             dialog.run()
             dialog.destroy()
+        return False
     
+    def on_export_clicked(self, button):
+        """Export the selected range of recorded samples to a file"""
+        extension = self.export_format_combo.get_active_id()
+        dialog = Gtk.FileChooserDialog(
+            title="Export History",
+            transient_for=self,
+            action=Gtk.FileChooserAction.SAVE
+        )
+        dialog.add_buttons(Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL,
+                           Gtk.STOCK_SAVE, Gtk.ResponseType.OK)
+        dialog.set_do_overwrite_confirmation(True)
+        dialog.set_current_name(f"monitor-history-{datetime.now().strftime('%Y%m%d-%H%M')}{extension}")
+        response = dialog.run()
+        path = dialog.get_filename()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or not path:
+            return
+        if not path.endswith(extension):
+            path += extension
+
+        hours = self.export_hours_spin.get_value_as_int()
+        start = time.time() - hours * 3600 if hours else None
+        samples = self.recorder.select(start=start)
+        self.update_status(f"Exporting {len(samples)} samples...")
+        threading.Thread(target=self.export_history, args=(samples, path), daemon=True).start()
+
+    def export_history(self, samples, path):
+        try:
+            count = export_samples(samples, path)
+            GLib.idle_add(self.update_status, f"✅ Exported {count} samples to {path}")
+        except Exception as e:
+            print(f"❌ Failed to export history: {e}")
+            GLib.idle_add(self.update_status, f"❌ Failed to export history: {e}")
+
+    def describe_password_source(self):
+        """Describe where the SMTP password is read from, without showing it"""
+        if self.config.password_file:
+            source = f"file {self.config.password_file}"
+        else:
+            source = f"${self.config.password_env}"
+        state = "loaded" if self.config.smtp_password else "not set"
+        return f"from {source} ({state})"
+
+    def apply_config(self, config):
+        """Apply a reloaded config to the running monitor"""
+        self.config = config
+
+        # Setting the widgets runs the usual change handlers, so thresholds,
+        # interval and history size take effect exactly as if edited by hand.
+        # The monitoring thread picks up the new interval on its next sleep.
+        self.memory_threshold_spin.set_value(config.memory_threshold)
+        self.cpu_threshold_spin.set_value(config.cpu_threshold)
+        self.interval_spin.set_value(config.interval)
+        self.history_spin.set_value(config.history_max)
+        self.recorder.resize(history_capacity(config.record_max, config.history_budget_kb))
+        self.email_entry.set_text(config.email_recipient)
+        self.sender_entry.set_text(config.sender_email)
+        self.password_source_label.set_text(self.describe_password_source())
+
+        # Channels whose settings are unchanged keep their workers and backlog
+        self.notifications.max_pending = config.notify_queue_size
+        self.notifications.max_retries = config.notify_max_retries
+        self.notifications.set_notifiers(self.build_notifiers(config))
+        self.schedule_check.set_active(config.report_schedule != "off")
+        if config.report_schedule != "off":
+            self.frequency_combo.set_active_id(config.report_schedule)
+
+        self.update_status(f"Config reloaded from {config.path}")
+        return False
+
     def update_status(self, message):
         """Update the status bar with a message"""
         self.status_bar.pop(self.status_context)
@@ -700,6 +934,16 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         """Handle CPU threshold change"""
         self.cpu_alert_threshold = spin_button.get_value_as_int()
     
+    def build_notifiers(self, config):
+        """Notifiers for config, with the sender and alert recipient shown in the GUI"""
+        return build_notifiers(config, sender_email=self.sender_entry.get_text(),
+                               recipient=self.email_entry.get_text())
+
+    def on_email_settings_changed(self, entry, event):
+        """Handle sender or recipient email change once editing is finished"""
+        self.notifications.set_notifiers(self.build_notifiers(self.config))
+        return False
+
     def on_email_changed(self, entry):
         """Handle email recipient change"""
         self.email_recipient = entry.get_text()
@@ -707,6 +951,9 @@ class MemoryCpuMonitorWindow(Gtk.Window):
     def on_interval_changed(self, spin_button):
         """Handle monitoring interval change"""
         self.monitoring_interval = spin_button.get_value_as_int()
+        self.interval_changed.set()
+        with self.report_lock:
+            self.report_scheduler.set_interval(self.monitoring_interval)
     
     def on_history_changed(self, spin_button):
         """Handle history size change"""
@@ -719,6 +966,19 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         # Update the graph
         self.update_cpu_history_graph()
     
+    def on_schedule_toggled(self, check_button):
+        """Handle periodic report toggle"""
+        self.report_schedule_enabled = check_button.get_active()
+
+    def on_frequency_changed(self, combo):
+        """Handle periodic report frequency change"""
+        period = combo.get_active_id()
+        if period in REPORT_PERIODS:
+            with self.report_lock:
+                finished = self.report_scheduler.set_period(period)
+            if finished is not None and self.report_schedule_enabled:
+                self.send_scheduled_report(finished)
+
     def on_check_clicked(self, button):
         """Handle manual check button click"""
         threading.Thread(target=self.check_memory_cpu_once).start()
@@ -730,7 +990,19 @@ class MemoryCpuMonitorWindow(Gtk.Window):
             self.is_monitoring = True
             self.start_button.set_sensitive(False)
             self.stop_button.set_sensitive(True)
-            self.update_status("Monitoring started")
+            if self.replay is None:
+                self.update_status("Monitoring started")
+            else:
+                if self.replay.finished:
+                    self.replay.rewind()
+                    self.cpu_history = []
+                    self.replay_alert_count = 0
+                    # Start the report periods over too, or the replayed
+                    # timestamps never pass the end of the last window again
+                    with self.report_lock:
+                        self.report_scheduler = ReportScheduler(self.report_scheduler.period,
+                                                                self.monitoring_interval)
+                self.update_status(f"Replay started at {self.replay.speed:g}x")
             
             # Start monitoring in a separate thread
             self.monitoring_thread = threading.Thread(target=self.monitor_resources)
@@ -741,18 +1013,66 @@ class MemoryCpuMonitorWindow(Gtk.Window):
         """Stop monitoring"""
         if self.is_monitoring:
             self.is_monitoring = False
+            self.interval_changed.set()
             self.start_button.set_sensitive(True)
             self.stop_button.set_sensitive(False)
             self.update_status("Monitoring stopped")
     
     def monitor_resources(self):
         """Monitor resources at regular intervals"""
+        if self.replay is not None:
+            self.replay_resources()
+            return
         while self.is_monitoring:
             self.check_memory_cpu_once()
-            time.sleep(self.monitoring_interval)
+            last_check = time.monotonic()
+
+            # Wait out the interval, re-reading it whenever it changes
+            while self.is_monitoring:
+                remaining = last_check + self.monitoring_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.interval_changed.wait(remaining)
+                self.interval_changed.clear()
+
+    def replay_resources(self):
+        """Feed recorded samples through the monitor at the replay speed"""
+        for sample in self.replay.play(lambda: not self.is_monitoring):
+            self.add_cpu_history(datetime.fromtimestamp(sample.timestamp), sample.cpu_percent)
+            self.aggregate_sample(sample)
+            self.process_sample(sample)
+        if self.replay.finished:
+            GLib.idle_add(self.on_replay_finished)
+
+    def on_replay_finished(self):
+        self.on_stop_clicked(self.stop_button)
+        self.update_status(f"Replay finished: {len(self.replay.samples)} samples, "
+                           f"{self.replay_alert_count} alerts")
+        return False
 
 if __name__ == "__main__":
-    window = MemoryCpuMonitorWindow()
+    parser = argparse.ArgumentParser(description="Memory & CPU Monitor")
+    parser.add_argument("--config", help="path to a TOML or JSON config file "
+                        "(default: $MEMORY_MONITOR_CONFIG or ~/.config/memory-monitor/config.toml)")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay an exported history file (.csv, .csv.gz or .parquet) instead of live data")
+    parser.add_argument("--speed", type=float, default=60.0,
+                        help="replay speed as a multiple of real time (default: 60)")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be greater than 0")
+
+    replay_samples = None
+    if args.replay:
+        replay_samples = import_samples(args.replay)
+        if not replay_samples:
+            parser.error(f"{args.replay} contains no samples")
+
+    try:
+        window = MemoryCpuMonitorWindow(config_path=args.config, replay_samples=replay_samples,
+                                        replay_speed=args.speed)
+    except ConfigError as e:
+        parser.exit(1, f"❌ {e}\n")
     window.connect("destroy", Gtk.main_quit)
     window.show_all()
     Gtk.main()
\ No newline at end of file
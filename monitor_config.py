@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Persistent configuration for the memory & CPU monitor.
+
+Settings are read from a TOML or JSON file (chosen by extension) and the SMTP
+password is read from a separate file or an environment variable, never from
+the config file itself. A ConfigWatcher follows the file with inotify so
+changes pushed to a host are applied without restarting the monitor.
+"""
+import json
+import os
+import select
+import struct
+import threading
+import time
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+DEFAULT_CONFIG_PATH = os.path.expanduser("~/.config/memory-monitor/config.toml")
+CONFIG_PATH_ENV = "MEMORY_MONITOR_CONFIG"
+DEFAULT_PASSWORD_ENV = "MEMORY_MONITOR_SMTP_PASSWORD"
+
+# Key -> (type, default, lower bound, upper bound). Bounds mirror the ranges of
+# the spin buttons in the GUI so a file can never hold a value the UI rejects.
+SETTINGS = {
+    "memory_threshold": (int, 90, 1, 100),
+    "cpu_threshold": (int, 80, 1, 100),
+    "interval": (int, 60, 5, 3600),
+    "history_max": (int, 20, 5, 100),
+    "record_max": (int, 10080, 100, 1000000),
+    "history_budget_kb": (int, 0, 0, 1048576),
+    "email_recipient": (str, "", None, None),
+    "sender_email": (str, "", None, None),
+    "smtp_host": (str, "smtp.gmail.com", None, None),
+    "smtp_port": (int, 587, 1, 65535),
+    "password_file": (str, "", None, None),
+    "password_env": (str, DEFAULT_PASSWORD_ENV, None, None),
+    "notify_email": (bool, True, None, None),
+    "webhook_url": (str, "", None, None),
+    "syslog_address": (str, "", None, None),
+    "unix_socket_path": (str, "", None, None),
+    "notify_batch_size": (int, 20, 1, 1000),
+    "notify_batch_interval": (int, 10, 0, 3600),
+    "notify_max_retries": (int, 5, 0, 100),
+    "notify_queue_size": (int, 1000, 10, 100000),
+    "report_schedule": (str, "off", None, None),
+    "report_recipient": (str, "", None, None),
+}
+REPORT_SCHEDULES = ("off", "hourly", "daily", "weekly")
+
+
+class ConfigError(ValueError):
+    """Raised when a config file cannot be parsed or holds invalid values"""
+
+
+class MonitorConfig:
+    """Validated monitor settings plus the resolved SMTP password"""
+
+    def __init__(self, values=None, path=None):
+        self.path = path
+        values = dict(values or {})
+
+        unknown = set(values) - set(SETTINGS)
+        if unknown:
+            raise ConfigError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+
+        for key, (kind, default, lower, upper) in SETTINGS.items():
+            value = values.get(key, default)
+            if kind is int and (isinstance(value, bool) or not isinstance(value, int)):
+                raise ConfigError(f"{key} must be an integer, got {value!r}")
+            if kind is bool and not isinstance(value, bool):
+                raise ConfigError(f"{key} must be true or false, got {value!r}")
+            if kind is str and not isinstance(value, str):
+                raise ConfigError(f"{key} must be a string, got {value!r}")
+            if lower is not None and not lower <= value <= upper:
+                raise ConfigError(f"{key} must be between {lower} and {upper}, got {value}")
+            setattr(self, key, value)
+
+        if self.webhook_url and not self.webhook_url.startswith(("http://", "https://")):
+            raise ConfigError(f"webhook_url must be an http:// or https:// URL, got {self.webhook_url!r}")
+        if self.report_schedule not in REPORT_SCHEDULES:
+            raise ConfigError(f"report_schedule must be one of {', '.join(REPORT_SCHEDULES)}, "
+                              f"got {self.report_schedule!r}")
+
+        self.smtp_password = self.read_password()
+
+    def read_password(self):
+        """Resolve the SMTP password from password_file, then password_env"""
+        if self.password_file:
+            try:
+                with open(os.path.expanduser(self.password_file), "r") as f:
+                    return f.read().strip()
+            except OSError as e:
+                raise ConfigError(f"Cannot read password file {self.password_file}: {e}")
+        if self.password_env:
+            return os.environ.get(self.password_env, "")
+        return ""
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in SETTINGS}
+
+    def __eq__(self, other):
+        if not isinstance(other, MonitorConfig):
+            return NotImplemented
+        return self.as_dict() == other.as_dict() and self.smtp_password == other.smtp_password
+
+
+def resolve_config_path(path=None):
+    """Pick the config path from the argument, the environment or the default"""
+    return os.path.expanduser(path or os.environ.get(CONFIG_PATH_ENV) or DEFAULT_CONFIG_PATH)
+
+
+def load_config(path=None):
+    """Load a MonitorConfig; a missing file yields the defaults"""
+    path = resolve_config_path(path)
+    if not os.path.exists(path):
+        return MonitorConfig(path=path)
+
+    try:
+        if path.endswith(".json"):
+            with open(path, "r") as f:
+                values = json.load(f)
+        else:
+            if tomllib is None:
+                raise ConfigError("TOML config files need Python 3.11+, use a .json file instead")
+            with open(path, "rb") as f:
+                values = tomllib.load(f)
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"Cannot load config {path}: {e}")
+
+    if not isinstance(values, dict):
+        raise ConfigError(f"Config {path} must contain a table/object at the top level")
+    return MonitorConfig(values, path=path)
+
+
+class ConfigWatcher:
+    """Reload the config file when it changes and hand the result to a callback.
+
+    The parent directory is watched rather than the file, so editors and
+    deployment tools that replace the file with a rename are picked up too.
+    Falls back to polling the mtime where inotify is unavailable. Invalid
+    files are reported and ignored; the previous config stays in effect.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, path, on_change, current=None, poll_interval=2.0, settle_delay=0.2):
+        self.path = resolve_config_path(path)
+        self.on_change = on_change
+        self.current = current
+        self.poll_interval = poll_interval
+        self.settle_delay = settle_delay
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+    def reload(self):
+        """Load the file and notify the callback if the settings changed"""
+        try:
+            config = load_config(self.path)
+        except ConfigError as e:
+            print(f"❌ Ignoring invalid config: {e}")
+            return
+        if config != self.current:
+            self.current = config
+            self.on_change(config)
+
+    def _run(self):
+        fd = self._inotify_open()
+        try:
+            if fd is None:
+                self._poll()
+            else:
+                self._follow(fd)
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _inotify_open(self):
+        try:
+            import ctypes
+            # The symbols of the running process include libc on Linux;
+            # this avoids ctypes.util.find_library, which forks ldconfig
+            libc = ctypes.CDLL(None, use_errno=True)
+            inotify_init1 = libc.inotify_init1
+            inotify_add_watch = libc.inotify_add_watch
+        except (ImportError, OSError, AttributeError):
+            return None
+
+        fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError:
+            # e.g. a read-only home directory; polling copes with a missing file
+            os.close(fd)
+            return None
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _follow(self, fd):
+        name = os.fsencode(os.path.basename(self.path))
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], self.poll_interval)
+            if not ready:
+                continue
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                continue
+
+            touched = False
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                event_name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if event_name == name:
+                    touched = True
+
+            if touched:
+                # Writers often emit several events per save; let them settle
+                time.sleep(self.settle_delay)
+                self._drain(fd)
+                self.reload()
+
+    def _drain(self, fd):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _poll(self):
+        last_mtime = self._mtime()
+        while not self._stop.wait(self.poll_interval):
+            mtime = self._mtime()
+            if mtime != last_mtime:
+                last_mtime = mtime
+                self.reload()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Low-overhead memory & CPU monitor for small and embedded hosts.
+
+Runs the same thresholds, alerts, notification channels, scheduled reports
+and config hot reload as the GTK monitor, without any GUI imports and without
+forking: memory, CPU and load are read straight from /proc. smtplib/email
+are only imported when an alert is actually delivered, sample history lives
+in a preallocated array capped by history_budget_kb, and the monitor's own
+startup time and RSS are printed so the budget can be verified on the host.
+With --export-on-exit the history is written out (CSV, .csv.gz or .parquet)
+when the monitor exits and whenever it receives SIGUSR1, for use with the GUI
+monitor's --replay. Top processes are not tracked in this mode, since that
+needs a ps fork.
+"""
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+
+from monitor_config import ConfigError, ConfigWatcher, load_config
+from monitor_history import (Sample, SampleRecorder, check_thresholds, export_samples,
+                             history_capacity)
+from monitor_notifiers import (NotificationQueue, alert_notification, build_notifiers,
+                               scheduled_report_notification)
+from monitor_stats import ReportScheduler
+
+DEFAULT_HISTORY_BUDGET_KB = 256
+
+
+def read_memory():
+    """Return (percent used, total MB, used MB, free MB) from /proc/meminfo"""
+    fields = {}
+    with open("/proc/meminfo", "r") as f:
+        for line in f:
+            name, value = line.split(":", 1)
+            if name in ("MemTotal", "MemFree", "MemAvailable"):
+                fields[name] = int(value.split()[0])  # kB
+    total = fields["MemTotal"]
+    free = fields["MemFree"]
+    # Same definition of "used" as free(1): what is not available to new programs
+    used = total - fields.get("MemAvailable", free)
+    return int(used * 100 / total), total // 1024, used // 1024, free // 1024
+
+
+class CpuSampler:
+    """CPU usage from the change in /proc/stat counters between calls"""
+
+    def __init__(self):
+        self.previous = self.read_times()
+
+    def read_times(self):
+        with open("/proc/stat", "r") as f:
+            values = [int(v) for v in f.readline().split()[1:9]]
+        # Busy is everything but idle, matching the 100 - idle used with top
+        return sum(values), values[3]
+
+    def percent(self):
+        total, idle = self.read_times()
+        previous_total, previous_idle = self.previous
+        self.previous = (total, idle)
+        elapsed = total - previous_total
+        if elapsed <= 0:
+            return 0.0
+        return 100.0 * (elapsed - (idle - previous_idle)) / elapsed
+
+
+def read_footprint():
+    """Return the (current, peak) resident set size of this process in kB"""
+    rss = peak = 0
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+            elif line.startswith("VmHWM:"):
+                peak = int(line.split()[1])
+    return rss, peak
+
+
+def process_age():
+    """Seconds since this process was started, interpreter startup included"""
+    with open("/proc/self/stat", "r") as f:
+        # Fields after the parenthesised command name start at field 3
+        start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+    with open("/proc/uptime", "r") as f:
+        uptime = float(f.read().split()[0])
+    return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+class HeadlessMonitor:
+    def __init__(self, config_path=None, export_path=None):
+        self.config = load_config(config_path)  # ConfigError if the file is invalid
+        self.export_path = export_path
+        self.export_requested = False  # set from the SIGUSR1 handler
+
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.interval_changed = threading.Event()  # wakes the sampling loop early
+        self.recorder = SampleRecorder(self.history_capacity(self.config))
+        self.cpu = CpuSampler()
+        self.cpu_count = os.cpu_count() or 1
+        self.report_scheduler = None
+        if self.config.report_schedule != "off":
+            self.report_scheduler = ReportScheduler(self.config.report_schedule, self.config.interval)
+        # Created on the first notification, so an idle monitor has no extra threads
+        self.notifications = None
+
+        self.config_watcher = ConfigWatcher(config_path, self.apply_config, current=self.config)
+        self.config_watcher.start()
+
+    def history_capacity(self, config):
+        return history_capacity(config.record_max,
+                                config.history_budget_kb or DEFAULT_HISTORY_BUDGET_KB)
+
+    def take_sample(self):
+        mem_percent, total_mem, used_mem, free_mem = read_memory()
+        return Sample(time.time(), mem_percent, total_mem, used_mem, free_mem,
+                      self.cpu.percent(), self.cpu_count, os.getloadavg()[0])
+
+    def check_once(self):
+        sample = self.take_sample()
+        self.recorder.record(sample)
+        config = self.config
+
+        for resource_type, percent_used, threshold in check_thresholds(
+                sample, config.memory_threshold, config.cpu_threshold):
+            self.send_alert(resource_type, percent_used, threshold)
+
+        with self.lock:
+            finished = None
+            if self.report_scheduler is not None:
+                finished = self.report_scheduler.add(sample, config.memory_threshold,
+                                                     config.cpu_threshold, track_processes=False)
+        if finished is not None:
+            self.send_scheduled_report(finished)
+        return sample
+
+    def send_alert(self, resource_type, percent_used, threshold):
+        notification = alert_notification(resource_type, percent_used, threshold,
+                                          recipient=self.config.email_recipient or None)
+        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {notification.body}")
+        self.notify(notification)
+
+    def send_scheduled_report(self, window):
+        recipient = self.config.report_recipient or self.config.email_recipient or None
+        self.notify(scheduled_report_notification(window.period, window, recipient=recipient))
+
+    def notify(self, notification):
+        with self.lock:
+            if self.notifications is None:
+                self.notifications = NotificationQueue(
+                    build_notifiers(self.config),
+                    max_pending=self.config.notify_queue_size,
+                    max_retries=self.config.notify_max_retries
+                )
+        self.notifications.submit(notification)
+
+    def apply_config(self, config):
+        """Apply a reloaded config; called from the config watcher thread"""
+        finished = None
+        with self.lock:
+            if config.interval != self.config.interval:
+                self.interval_changed.set()
+            self.config = config
+            self.recorder.resize(self.history_capacity(config))
+            if config.report_schedule == "off":
+                self.report_scheduler = None
+            elif self.report_scheduler is None:
+                self.report_scheduler = ReportScheduler(config.report_schedule, config.interval)
+            else:
+                self.report_scheduler.set_interval(config.interval)
+                finished = self.report_scheduler.set_period(config.report_schedule)
+            if self.notifications is not None:
+                self.notifications.max_pending = config.notify_queue_size
+                self.notifications.max_retries = config.notify_max_retries
+                self.notifications.set_notifiers(build_notifiers(config))
+        if finished is not None:
+            self.send_scheduled_report(finished)
+        print(f"Config reloaded from {config.path}")
+
+    def print_footprint(self, label):
+        rss, peak = read_footprint()
+        print(f"[footprint] {label}: RSS {rss} kB (peak {peak} kB), "
+              f"history {len(self.recorder)}/{self.recorder.capacity} samples "
+              f"in {self.recorder.nbytes // 1024} kB")
+
+    def run(self, footprint_interval=3600, max_samples=None):
+        ready = process_age()
+        # /proc/stat counters need a short baseline before the first reading
+        self.stop_event.wait(0.5)
+        taken = 0
+        last_footprint = time.monotonic()
+        while not self.stop_event.is_set():
+            sample = self.check_once()
+            taken += 1
+            if taken == 1:
+                print(f"[footprint] startup: {ready * 1000:.0f} ms to ready, "
+                      f"{process_age() * 1000:.0f} ms to first sample "
+                      f"(memory {sample.mem_percent}%, CPU {sample.cpu_percent:.1f}%)")
+                self.print_footprint("after first sample")
+            elif footprint_interval and time.monotonic() - last_footprint >= footprint_interval:
+                last_footprint = time.monotonic()
+                self.print_footprint("steady state")
+            if max_samples is not None and taken >= max_samples:
+                break
+            self.wait_interval()
+
+        self.print_footprint("exit")
+        if self.export_path:
+            self.export_history()
+        self.config_watcher.stop()
+        if self.notifications is not None:
+            self.notifications.close()
+
+    def wait_interval(self):
+        """Sleep until the next sample is due, re-reading the interval whenever it changes"""
+        last_check = time.monotonic()
+        while not self.stop_event.is_set():
+            if self.export_requested:
+                self.export_requested = False
+                self.export_history()
+            remaining = last_check + self.config.interval - time.monotonic()
+            if remaining <= 0:
+                return
+            self.interval_changed.wait(remaining)
+            self.interval_changed.clear()
+
+    def export_history(self):
+        """Write the recorded samples to export_path"""
+        try:
+            count = export_samples(self.recorder.select(), self.export_path)
+        except (OSError, RuntimeError) as e:
+            print(f"❌ Failed to export history to {self.export_path}: {e}")
+            return
+        print(f"Exported {count} samples to {self.export_path}")
+
+    def request_export(self, *args):
+        # Signal handlers must not take the recorder lock; the sampling
+        # loop does the export when it wakes up
+        self.export_requested = True
+        self.interval_changed.set()
+
+    def stop(self, *args):
+        self.stop_event.set()
+        self.interval_changed.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Low-overhead Memory & CPU Monitor (no GUI)")
+    parser.add_argument("--config", help="path to a TOML or JSON config file "
+                        "(default: $MEMORY_MONITOR_CONFIG or ~/.config/memory-monitor/config.toml)")
+    parser.add_argument("--footprint-interval", type=int, default=3600,
+                        help="seconds between RSS reports, 0 to disable (default: 3600)")
+    parser.add_argument("--samples", type=int,
+                        help="exit after this many samples, e.g. to measure the footprint")
+    parser.add_argument("--export-on-exit", metavar="FILE",
+                        help="write the sample history to FILE (.csv, .csv.gz or .parquet) "
+                        "on exit and on SIGUSR1")
+    args = parser.parse_args()
+
+    # Under systemd or a redirect stdout is block-buffered; flush every
+    # footprint and alert line so they show up as they happen
+    sys.stdout.reconfigure(line_buffering=True)
+
+    try:
+        monitor = HeadlessMonitor(config_path=args.config, export_path=args.export_on_exit)
+    except ConfigError as e:
+        parser.exit(1, f"❌ {e}\n")
+    signal.signal(signal.SIGTERM, monitor.stop)
+    signal.signal(signal.SIGINT, monitor.stop)
+    if args.export_on_exit:
+        signal.signal(signal.SIGUSR1, monitor.request_export)
+    monitor.run(footprint_interval=args.footprint_interval, max_samples=args.samples)
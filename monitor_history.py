@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Sample history for the memory & CPU monitor.
+
+Keeps a bounded, array-backed record of every sample the monitor takes,
+exports a time range of it to compressed CSV or Parquet, imports such files
+back and plays them through the monitor at accelerated speed (replay mode).
+"""
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+Sample = namedtuple("Sample", [
+    "timestamp",     # seconds since the epoch
+    "mem_percent",
+    "total_mem",     # MB
+    "used_mem",      # MB
+    "free_mem",      # MB
+    "cpu_percent",
+    "cpu_count",
+    "load_avg",
+])
+
+# Column types, used to parse CSV rows back into samples
+FIELD_TYPES = (float, int, int, int, int, float, int, float)
+
+
+def check_thresholds(sample, memory_threshold, cpu_threshold):
+    """Return (resource, percent, threshold) for every threshold the sample crosses"""
+    alerts = []
+    if sample.mem_percent >= memory_threshold:
+        alerts.append(("Memory", sample.mem_percent, memory_threshold))
+    if sample.cpu_percent >= cpu_threshold:
+        alerts.append(("CPU", sample.cpu_percent, cpu_threshold))
+    return alerts
+
+
+class SampleRecorder:
+    """Thread-safe ring buffer of the most recent samples.
+
+    Samples are stored flat in a preallocated array of doubles instead of as
+    tuples, BYTES_PER_SAMPLE bytes each, so the buffer's memory is fixed when
+    it is allocated and can be bounded by a byte budget.
+    """
+
+    FIELDS = len(Sample._fields)
+    BYTES_PER_SAMPLE = FIELDS * array("d").itemsize
+
+    def __init__(self, max_samples):
+        self.lock = threading.Lock()
+        self.allocate(max_samples)
+
+    def allocate(self, max_samples, keep=()):
+        self.capacity = max_samples
+        self.values = array("d", bytes(max_samples * self.BYTES_PER_SAMPLE))
+        self.start = 0
+        self.count = 0
+        for sample in list(keep)[-max_samples:]:
+            self._append(sample)
+
+    def record(self, sample):
+        with self.lock:
+            self._append(sample)
+
+    def resize(self, max_samples):
+        """Change the capacity, keeping the newest samples"""
+        with self.lock:
+            if max_samples != self.capacity:
+                self.allocate(max_samples, keep=[self._get(i) for i in range(self.count)])
+
+    def select(self, start=None, end=None):
+        """Return the samples with start <= timestamp <= end (either may be None)"""
+        with self.lock:
+            selected = []
+            for i in range(self.count):
+                timestamp = self.values[self._offset(i)]
+                if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                    selected.append(self._get(i))
+            return selected
+
+    def latest(self):
+        with self.lock:
+            return self._get(self.count - 1) if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return len(self.values) * self.values.itemsize
+
+    def _offset(self, i):
+        return ((self.start + i) % self.capacity) * self.FIELDS
+
+    def _append(self, sample):
+        if self.count < self.capacity:
+            offset = self._offset(self.count)
+            self.count += 1
+        else:
+            # Full: overwrite the oldest sample
+            offset = self._offset(0)
+            self.start = (self.start + 1) % self.capacity
+        self.values[offset:offset + self.FIELDS] = array("d", sample)
+
+    def _get(self, i):
+        offset = self._offset(i)
+        row = self.values[offset:offset + self.FIELDS]
+        return Sample(*(kind(value) for kind, value in zip(FIELD_TYPES, row)))
+
+
+def history_capacity(record_max, budget_kb=0):
+    """Number of samples to keep: record_max, capped by a memory budget if one is set"""
+    if budget_kb:
+        return max(min(record_max, budget_kb * 1024 // SampleRecorder.BYTES_PER_SAMPLE), 1)
+    return record_max
+
+
+def export_samples(samples, path):
+    """Write samples to path; the format follows the extension.
+
+    .csv.gz -> gzip-compressed CSV, .csv -> plain CSV,
+    .parquet -> zstd-compressed Parquet (needs pyarrow).
+    """
+    import csv
+    import gzip
+
+    if path.endswith(".parquet"):
+        pa, pq = _import_pyarrow()
+        columns = {name: [getattr(s, name) for s in samples] for name in Sample._fields}
+        pq.write_table(pa.table(columns), path, compression="zstd")
+        return len(samples)
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Sample._fields)
+        writer.writerows(samples)
+    return len(samples)
+
+
+def import_samples(path):
+    """Read samples written by export_samples, sorted by timestamp"""
+    import csv
+    import gzip
+
+    if path.endswith(".parquet"):
+        _, pq = _import_pyarrow()
+        columns = pq.read_table(path, columns=list(Sample._fields)).to_pydict()
+        samples = [Sample(*row) for row in zip(*(columns[name] for name in Sample._fields))]
+    else:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return []
+            if tuple(header) != Sample._fields:
+                raise ValueError(f"{path} is not a monitor history export (header {header})")
+            samples = [
+                Sample(*(kind(float(value)) for kind, value in zip(FIELD_TYPES, row)))
+                for row in reader if row
+            ]
+    samples.sort(key=lambda s: s.timestamp)
+    return samples
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export/import needs pyarrow (pip install pyarrow), "
+                           "use a .csv.gz file instead")
+    return pyarrow, pyarrow.parquet
+
+
+class ReplayPlayer:
+    """Plays recorded samples back in time order, speed times faster than recorded.
+
+    Gaps longer than max_gap seconds (e.g. the monitor was stopped) are
+    shortened to max_gap before scaling, so replays don't stall on them.
+    The position is kept between calls to play(), so a paused replay resumes
+    where it stopped.
+    """
+
+    def __init__(self, samples, speed=60.0, max_gap=300.0):
+        if speed <= 0:
+            raise ValueError(f"Replay speed must be greater than 0, got {speed}")
+        self.samples = list(samples)
+        self.speed = speed
+        self.max_gap = max_gap
+        self.position = 0
+
+    @property
+    def finished(self):
+        return self.position >= len(self.samples)
+
+    @property
+    def current(self):
+        """The most recently played sample, or the first one before playback"""
+        if not self.samples:
+            return None
+        return self.samples[max(self.position - 1, 0)]
+
+    def rewind(self):
+        self.position = 0
+
+    def play(self, should_stop=lambda: False):
+        """Yield samples with scaled delays until done or should_stop() is true"""
+        while not self.finished and not should_stop():
+            sample = self.samples[self.position]
+            if self.position > 0:
+                gap = min(sample.timestamp - self.samples[self.position - 1].timestamp, self.max_gap)
+                deadline = time.monotonic() + max(gap, 0) / self.speed
+                while not should_stop() and time.monotonic() < deadline:
+                    time.sleep(min(0.1, max(deadline - time.monotonic(), 0)))
+                if should_stop():
+                    return
+            self.position += 1
+            yield sample
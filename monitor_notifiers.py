@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""Notification channels for the memory & CPU monitor.
+
+Alerts and reports are submitted to a NotificationQueue, which fans them out
+to every configured channel (email, HTTP webhook, syslog/journald, Unix
+socket). Submitting never blocks: the queue is bounded and each channel has
+its own worker thread that batches, retries with exponential backoff and
+finally drops what it cannot deliver, so a slow endpoint never stalls the
+sampler or the other channels.
+
+smtplib, email, http.client and urllib are imported only when a channel that
+needs them is configured or first delivers, so an idle monitor on a small host
+never pays for them.
+"""
+import json
+import os
+import queue
+import random
+import socket
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+Notification = namedtuple("Notification", [
+    "timestamp",   # seconds since the epoch
+    "kind",        # "alert" or "report"
+    "subject",
+    "body",
+    "recipient",   # email recipient, None for the channel default
+    "fields",      # dict of structured data for machine-readable channels
+])
+
+
+def make_notification(kind, subject, body, recipient=None, **fields):
+    return Notification(time.time(), kind, subject, body, recipient, fields)
+
+
+def alert_notification(resource_type, percent_used, threshold, recipient=None):
+    """Build the notification for a resource crossing its alert threshold"""
+    subject = f"ALERT: {resource_type} usage at {percent_used:.1f}%"
+    body = f"⚠️ Your system {resource_type.lower()} usage is at {percent_used:.1f}%, which exceeds the threshold of {threshold}%."
+    return make_notification("alert", subject, body, recipient=recipient,
+                             resource=resource_type, percent=percent_used, threshold=threshold)
+
+
+def scheduled_report_notification(period, window, recipient=None):
+    """Build the notification for the summary of a finished report window"""
+    start = datetime.fromtimestamp(window.start)
+    subject = f"{period.capitalize()} System Resource Report - {start.strftime('%Y-%m-%d %H:%M')}"
+    body = window.format(title=f"{period.upper()} SUMMARY REPORT")
+    return make_notification("report", subject, body, recipient=recipient,
+                             period=period, start=window.start, end=window.end)
+
+
+def notification_to_dict(notification):
+    return {
+        "timestamp": notification.timestamp,
+        "kind": notification.kind,
+        "subject": notification.subject,
+        "body": notification.body,
+        **notification.fields,
+    }
+
+
+class DeliveryError(Exception):
+    """Raised by a notifier when a batch could not be delivered"""
+
+
+class PermanentDeliveryError(DeliveryError):
+    """Raised when retrying cannot help, e.g. the channel is misconfigured"""
+
+
+class Notifier:
+    """Base class for notification channels.
+
+    Subclasses implement deliver(), which sends a whole batch and raises on
+    failure; the queue takes care of batching and retries. key identifies the
+    channel configuration so unchanged channels survive a config reload.
+    """
+
+    name = "notifier"
+
+    def __init__(self, kinds=("alert", "report"), batch_size=20, batch_interval=10.0):
+        self.kinds = frozenset(kinds)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+
+    @property
+    def key(self):
+        return (self.name, self.kinds, self.batch_size, self.batch_interval)
+
+    def accepts(self, notification):
+        return notification.kind in self.kinds
+
+    def deliver(self, notifications):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class EmailNotifier(Notifier):
+    """Send notifications over SMTP with STARTTLS, one message per recipient"""
+
+    name = "email"
+
+    def __init__(self, host, port, sender, password, recipient, **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.recipient = recipient
+
+    @property
+    def key(self):
+        return super().key + (self.host, self.port, self.sender, self.password, self.recipient)
+
+    def deliver(self, notifications):
+        if not self.sender:
+            raise PermanentDeliveryError("No sender email configured")
+        by_recipient = {}
+        for notification in notifications:
+            recipient = notification.recipient or self.recipient
+            if not recipient:
+                raise PermanentDeliveryError("No email recipient configured")
+            by_recipient.setdefault(recipient, []).append(notification)
+
+        import smtplib
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            server.starttls()
+            try:
+                server.login(self.sender, self.password)
+            except smtplib.SMTPAuthenticationError as e:
+                raise PermanentDeliveryError(f"SMTP login as {self.sender} failed: {e}")
+            for recipient, batch in by_recipient.items():
+                server.send_message(self.build_message(recipient, batch))
+        finally:
+            server.quit()
+
+    def build_message(self, recipient, batch):
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
+        if len(batch) == 1:
+            subject, body = batch[0].subject, batch[0].body
+        else:
+            subject = f"{len(batch)} system monitor notifications"
+            body = "\n\n".join(f"{n.subject}\n{n.body}" for n in batch)
+
+        msg = MIMEMultipart()
+        msg["From"] = self.sender
+        msg["To"] = recipient
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain"))
+        return msg
+
+
+class WebhookNotifier(Notifier):
+    """POST batches as JSON to an HTTP(S) endpoint over pooled keep-alive connections"""
+
+    name = "webhook"
+
+    def __init__(self, url, pool_size=2, timeout=10.0, **kwargs):
+        super().__init__(**kwargs)
+        from urllib.parse import urlsplit
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported webhook URL: {url}")
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.timeout = timeout
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+
+    @property
+    def key(self):
+        return super().key + (self.url, self.pool.maxsize, self.timeout)
+
+    def deliver(self, notifications):
+        payload = json.dumps({
+            "source": socket.gethostname(),
+            "notifications": [notification_to_dict(n) for n in notifications],
+        }).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        import http.client
+        connection = self.acquire()
+        try:
+            connection.request("POST", self.path, body=payload, headers=headers)
+            response = connection.getresponse()
+            # Read the body so the connection can be reused
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise DeliveryError(f"Webhook {self.url} failed: {e}")
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.release(connection)
+        if response.status >= 300:
+            raise DeliveryError(f"Webhook {self.url} returned HTTP {response.status}")
+
+    def acquire(self):
+        try:
+            return self.pool.get_nowait()
+        except queue.Empty:
+            import http.client
+            if self.scheme == "https":
+                return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection):
+        try:
+            self.pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class SyslogNotifier(Notifier):
+    """Log notifications to the local syslog/journald socket or a UDP syslog server.
+
+    address is a socket path (default /dev/log, which journald also serves)
+    or "host:port" for UDP.
+    """
+
+    name = "syslog"
+    FACILITY_USER = 1
+    SEVERITY = {"alert": 4, "report": 6}  # warning, info
+
+    def __init__(self, address="/dev/log", tag="memory-monitor", **kwargs):
+        super().__init__(**kwargs)
+        self.address = address
+        self.tag = tag
+        self.sock = None
+
+    @property
+    def key(self):
+        return super().key + (self.address, self.tag)
+
+    def connect(self):
+        if self.address.startswith("/"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.connect(self.address)
+        else:
+            host, _, port = self.address.rpartition(":")
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.connect((host, int(port)))
+        return sock
+
+    def format(self, notification):
+        priority = self.FACILITY_USER * 8 + self.SEVERITY.get(notification.kind, 6)
+        stamp = time.strftime("%b %d %H:%M:%S", time.localtime(notification.timestamp))
+        text = f"{notification.subject}: {notification.body}".replace("\n", " | ")
+        return f"<{priority}>{stamp} {self.tag}[{os.getpid()}]: {text}".encode("utf-8")[:8192]
+
+    def deliver(self, notifications):
+        try:
+            if self.sock is None:
+                self.sock = self.connect()
+            for notification in notifications:
+                self.sock.send(self.format(notification))
+        except OSError as e:
+            self.close()
+            raise DeliveryError(f"Syslog {self.address} failed: {e}")
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class UnixSocketNotifier(Notifier):
+    """Stream notifications as newline-delimited JSON to a listening Unix socket"""
+
+    name = "unix-socket"
+
+    def __init__(self, path, timeout=5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.timeout = timeout
+        self.sock = None
+
+    @property
+    def key(self):
+        return super().key + (self.path, self.timeout)
+
+    def deliver(self, notifications):
+        data = b"".join(
+            json.dumps(notification_to_dict(n)).encode("utf-8") + b"\n" for n in notifications
+        )
+        try:
+            if self.sock is None:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.settimeout(self.timeout)
+                self.sock.connect(self.path)
+            self.sock.sendall(data)
+        except OSError as e:
+            self.close()
+            raise DeliveryError(f"Unix socket {self.path} failed: {e}")
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+def build_notifiers(config, sender_email=None, recipient=None):
+    """Create the notifiers enabled in a MonitorConfig.
+
+    sender_email and recipient override the configured alert sender and
+    recipient, e.g. with the ones shown in the GUI. Email is left out unless
+    there is a sender and someone to send to.
+    """
+    batching = {
+        "batch_size": config.notify_batch_size,
+        "batch_interval": config.notify_batch_interval,
+    }
+    notifiers = []
+    sender = sender_email or config.sender_email
+    recipient = recipient or config.email_recipient
+    if config.notify_email and sender and (recipient or config.report_recipient):
+        notifiers.append(EmailNotifier(
+            config.smtp_host, config.smtp_port, sender,
+            config.smtp_password, recipient, **batching
+        ))
+    if config.webhook_url:
+        notifiers.append(WebhookNotifier(config.webhook_url, **batching))
+    if config.syslog_address:
+        notifiers.append(SyslogNotifier(config.syslog_address, **batching))
+    if config.unix_socket_path:
+        notifiers.append(UnixSocketNotifier(config.unix_socket_path, **batching))
+    return notifiers
+
+
+class ChannelWorker:
+    """Batches and delivers the notifications for one channel on its own thread"""
+
+    def __init__(self, notifier, owner):
+        self.notifier = notifier
+        self.owner = owner  # the NotificationQueue, which holds the retry policy
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, daemon=True,
+                                       name=f"notifier-{notifier.name}")
+
+    def put(self, notification):
+        with self.condition:
+            if len(self.pending) >= self.owner.max_pending:
+                dropped = self.pending.popleft()
+                print(f"❌ {self.notifier.name}: backlog full, dropping '{dropped.subject}'")
+            self.pending.append(notification)
+            # An idle worker waits without a timeout; wake it to start the
+            # batch_interval clock, or to send a batch that is already full
+            if len(self.pending) == 1 or len(self.pending) >= self.notifier.batch_size:
+                self.condition.notify()
+
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+
+    def next_batch(self):
+        """Wait for a full batch, or for the oldest item to reach batch_interval"""
+        with self.condition:
+            while not self.stopping:
+                if len(self.pending) >= self.notifier.batch_size:
+                    break
+                if self.pending:
+                    age = time.time() - self.pending[0].timestamp
+                    if age >= self.notifier.batch_interval:
+                        break
+                    self.condition.wait(self.notifier.batch_interval - age)
+                else:
+                    self.condition.wait()
+            count = min(len(self.pending), self.notifier.batch_size)
+            return [self.pending.popleft() for _ in range(count)]
+
+    def run(self):
+        while True:
+            batch = self.next_batch()
+            if batch:
+                self.deliver(batch)
+            if self.stopping:
+                self.notifier.close()
+                return
+
+    def deliver(self, batch):
+        delay = self.owner.backoff
+        max_retries = self.owner.max_retries
+        for attempt in range(max_retries + 1):
+            try:
+                self.notifier.deliver(batch)
+                self.owner.on_result(self.notifier, batch, None)
+                return
+            except PermanentDeliveryError as e:
+                error = e
+                break
+            except Exception as e:
+                error = e
+            if attempt == max_retries:
+                break
+            # Back off with jitter; a stop request cuts the wait short
+            with self.condition:
+                if not self.stopping:
+                    self.condition.wait(delay * random.uniform(0.5, 1.0))
+                if self.stopping:
+                    break
+            delay = min(delay * 2, self.owner.max_backoff)
+
+        print(f"❌ {self.notifier.name}: dropping {len(batch)} notification(s): {error}")
+        self.owner.on_result(self.notifier, batch, error)
+
+
+class NotificationQueue:
+    """Bounded, non-blocking delivery queue shared by all notification channels"""
+
+    def __init__(self, notifiers=(), max_pending=1000, max_retries=5, backoff=1.0,
+                 max_backoff=60.0, on_result=None):
+        # Bounded by max_pending in submit(), so a reloaded limit applies at once
+        self.queue = queue.Queue()
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_result = on_result or (lambda notifier, batch, error: None)
+        self.lock = threading.Lock()
+        self.workers = {}
+        self.set_notifiers(notifiers)
+        self.dispatcher = threading.Thread(target=self.dispatch, daemon=True,
+                                           name="notification-dispatcher")
+        self.dispatcher.start()
+
+    @property
+    def notifiers(self):
+        with self.lock:
+            return [worker.notifier for worker in self.workers.values()]
+
+    def set_notifiers(self, notifiers):
+        """Switch to a new set of channels, keeping workers whose config is unchanged.
+
+        Returns the active notifiers, which are the existing instances for
+        channels that were kept.
+        """
+        with self.lock:
+            workers = {}
+            for notifier in notifiers:
+                worker = self.workers.pop(notifier.key, None)
+                if worker is None:
+                    worker = ChannelWorker(notifier, self)
+                    worker.thread.start()
+                workers[notifier.key] = worker
+            for worker in self.workers.values():
+                worker.stop()
+            self.workers = workers
+            return [worker.notifier for worker in workers.values()]
+
+    def submit(self, notification):
+        """Queue a notification; returns False if the queue is full and it was dropped"""
+        if self.queue.qsize() >= self.max_pending:
+            print(f"❌ Notification queue full, dropping '{notification.subject}'")
+            return False
+        self.queue.put_nowait(notification)
+        return True
+
+    def dispatch(self):
+        while True:
+            notification = self.queue.get()
+            if notification is None:
+                return
+            with self.lock:
+                workers = list(self.workers.values())
+            for worker in workers:
+                if worker.notifier.accepts(notification):
+                    worker.put(notification)
+
+    def close(self):
+        """Stop dispatching; workers flush what they already hold once"""
+        self.queue.put(None)
+        self.dispatcher.join(timeout=5)
+        self.set_notifiers(())
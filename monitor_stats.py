@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Incremental statistics and scheduled summary reports.
+
+Every sample is folded into running aggregates as it arrives (min/avg/max,
+streaming p95/p99 estimates, time above threshold, peak processes), so a
+summary for an hour, a day or a week is formatted in constant time instead of
+scanning the recorded history.
+"""
+import math
+import os
+import time
+from datetime import datetime, timedelta
+
+REPORT_PERIODS = ("hourly", "daily", "weekly")
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac).
+
+    Keeps five markers regardless of how many values are added, so memory
+    and per-value cost are constant.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.initial = []
+        self.heights = None
+        self.positions = None
+        self.desired = None
+        self.increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x):
+        if self.heights is None:
+            self.initial.append(x)
+            if len(self.initial) == 5:
+                self.heights = sorted(self.initial)
+                self.positions = [0, 1, 2, 3, 4]
+                p = self.p
+                self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+
+        q, n = self.heights, self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Nudge the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def value(self):
+        if self.heights is not None:
+            return self.heights[2]
+        if not self.initial:
+            return None
+        # Too few values for the markers: use the exact nearest-rank quantile
+        ordered = sorted(self.initial)
+        return ordered[max(math.ceil(self.p * len(ordered)) - 1, 0)]
+
+
+class MetricSummary:
+    """Running min/avg/max, p95/p99 and time spent above a threshold for one metric"""
+
+    def __init__(self, name, unit="%"):
+        self.name = name
+        self.unit = unit
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.p95 = P2Quantile(0.95)
+        self.p99 = P2Quantile(0.99)
+        self.seconds_above = 0.0
+
+    def add(self, value, duration=0.0, threshold=None):
+        """Fold in a value that held for duration seconds"""
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.p95.add(value)
+        self.p99.add(value)
+        if threshold is not None and value >= threshold:
+            self.seconds_above += duration
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+    def format(self, threshold=None):
+        if not self.count:
+            return [f"{self.name}: no samples"]
+        u = self.unit
+        lines = [
+            f"{self.name}: min {self.minimum:.1f}{u} | avg {self.average:.1f}{u} | max {self.maximum:.1f}{u}",
+            f"  p95 {self.p95.value():.1f}{u} | p99 {self.p99.value():.1f}{u}",
+        ]
+        if threshold is not None:
+            lines.append(f"  Time at or above {threshold}{u}: {format_duration(self.seconds_above)}")
+        return lines
+
+
+class ProcessTracker:
+    """Peak memory and CPU per command, sampled at most once per sample_interval.
+
+    CPU is measured from the change in each process's /proc/<pid>/stat
+    counters between two samples, not the lifetime average ps reports, so a
+    process needs to be seen twice before it has a CPU figure. Each sample
+    keeps the top_n processes by memory and the top_n by CPU, so a busy but
+    small process is reported as well as a large idle one. Only max_tracked
+    commands are kept, split between the two rankings, so the tracker stays
+    small however many processes come and go.
+    """
+
+    def __init__(self, sample_interval=60.0, top_n=10, max_tracked=50):
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+        self.max_tracked = max_tracked
+        self.peaks = {}  # command -> [peak mem %, peak cpu % or None]
+        self.cpu_ticks = {}  # pid -> (utime + stime ticks, monotonic time) at the last sample
+        self.last_sample = None
+
+    def maybe_sample(self, now=None):
+        now = time.time() if now is None else now
+        if self.last_sample is not None and now - self.last_sample < self.sample_interval:
+            return
+        self.last_sample = now
+        for command, mem, cpu in self.get_top_processes():
+            peak = self.peaks.setdefault(command, [0.0, None])
+            peak[0] = max(peak[0], mem)
+            if cpu is not None:
+                peak[1] = cpu if peak[1] is None else max(peak[1], cpu)
+        if len(self.peaks) > self.max_tracked:
+            keep = self.max_tracked // 2
+            kept = dict(self.ranked(0)[:keep])
+            for command, peak in self.ranked(1):
+                if len(kept) >= self.max_tracked:
+                    break
+                kept.setdefault(command, peak)
+            self.peaks = kept
+
+    def get_top_processes(self):
+        """Return (command, mem %, CPU % since the last sample or None) for the
+        top processes by memory and by CPU"""
+        import subprocess
+        try:
+            output = subprocess.check_output(["ps", "-eo", "pid=,%mem=,comm="], text=True)
+        except Exception as e:
+            print(f"Error getting top processes: {e}")
+            return []
+
+        processes = {}
+        cpu_ticks = {}
+        for line in output.splitlines():
+            pid, mem, command = line.split(None, 2)
+            ticks = self.read_cpu_ticks(pid)
+            cpu = None
+            if ticks is not None:
+                cpu_ticks[pid] = ticks
+                cpu = self.cpu_percent(self.cpu_ticks.get(pid), ticks)
+            processes[pid] = (command.strip(), float(mem), cpu)
+        # Only keep counters for processes that are still running
+        self.cpu_ticks = cpu_ticks
+
+        by_memory = sorted(processes, key=lambda pid: processes[pid][1], reverse=True)
+        by_cpu = sorted((pid for pid in processes if processes[pid][2] is not None),
+                        key=lambda pid: processes[pid][2], reverse=True)
+        top = dict.fromkeys(by_memory[:self.top_n] + by_cpu[:self.top_n])
+        return [processes[pid] for pid in top]
+
+    def read_cpu_ticks(self, pid):
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # Fields after the parenthesised command name start at field 3
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            return None  # the process has exited
+        return int(fields[11]) + int(fields[12]), time.monotonic()
+
+    def cpu_percent(self, previous, current):
+        if previous is None:
+            return None
+        elapsed = current[1] - previous[1]
+        if elapsed <= 0:
+            return None
+        return 100.0 * (current[0] - previous[0]) / os.sysconf("SC_CLK_TCK") / elapsed
+
+    def ranked(self, index):
+        """Tracked (command, peak) pairs by peak memory (index 0) or CPU (index 1)"""
+        known = [item for item in self.peaks.items() if item[1][index] is not None]
+        return sorted(known, key=lambda item: item[1][index], reverse=True)
+
+    def top(self, count=5):
+        """Return the (command, peak mem %, peak CPU % or None) lists for the
+        count commands with the highest peak memory and the highest peak CPU"""
+        by_memory = [(command, mem, cpu) for command, (mem, cpu) in self.ranked(0)[:count]]
+        by_cpu = [(command, mem, cpu) for command, (mem, cpu) in self.ranked(1)[:count]]
+        return by_memory, by_cpu
+
+
+class ReportWindow:
+    """Aggregates for every sample of one report period between start and end"""
+
+    def __init__(self, period, start, end):
+        self.period = period
+        self.start = start
+        self.end = end
+        self.memory = MetricSummary("Memory")
+        self.cpu = MetricSummary("CPU")
+        self.load = MetricSummary("Load average", unit="")
+        self.processes = ProcessTracker()
+        self.last_timestamp = None
+        self.memory_threshold = None
+        self.cpu_threshold = None
+
+    def add(self, sample, memory_threshold, cpu_threshold, duration=0.0):
+        """Fold in a sample that covers the duration seconds before it"""
+        self.last_timestamp = sample.timestamp
+        self.memory_threshold = memory_threshold
+        self.cpu_threshold = cpu_threshold
+
+        self.memory.add(sample.mem_percent, duration, memory_threshold)
+        self.cpu.add(sample.cpu_percent, duration, cpu_threshold)
+        self.load.add(sample.load_avg, duration)
+
+    @property
+    def count(self):
+        return self.memory.count
+
+    def format(self, title="SUMMARY REPORT"):
+        report = []
+        report.append("=" * 50)
+        report.append(title)
+        report.append("=" * 50)
+        report.append(f"Period: {datetime.fromtimestamp(self.start).strftime('%Y-%m-%d %H:%M')} - "
+                      f"{datetime.fromtimestamp(self.end).strftime('%Y-%m-%d %H:%M')}")
+        report.append(f"Samples: {self.count}")
+        report.append("")
+        report.append("-" * 50)
+        report.append("RESOURCE STATISTICS")
+        report.append("-" * 50)
+        report.extend(self.memory.format(self.memory_threshold))
+        report.extend(self.cpu.format(self.cpu_threshold))
+        report.extend(self.load.format())
+        report.append("")
+
+        by_memory, by_cpu = self.processes.top()
+        for title, top in (("TOP PROCESSES BY MEMORY (peak usage)", by_memory),
+                           ("TOP PROCESSES BY CPU (peak usage)", by_cpu)):
+            if not top:
+                continue
+            report.append("-" * 50)
+            report.append(title)
+            report.append("-" * 50)
+            for command, mem, cpu in top:
+                cpu_text = "n/a" if cpu is None else f"{cpu:.1f}%"
+                report.append(f"{command}: memory {mem:.1f}% | CPU {cpu_text}")
+            report.append("")
+
+        report.append("=" * 50)
+        return "\n".join(report)
+
+
+def period_bounds(period, timestamp):
+    """Return the (start, end) of the hourly/daily/weekly period containing timestamp"""
+    now = datetime.fromtimestamp(timestamp)
+    if period == "hourly":
+        start = now.replace(minute=0, second=0, microsecond=0)
+        end = start + timedelta(hours=1)
+    elif period == "daily":
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=1)
+    elif period == "weekly":
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=now.weekday())
+        end = start + timedelta(weeks=1)
+    else:
+        raise ValueError(f"Unknown report period: {period}")
+    return start.timestamp(), end.timestamp()
+
+
+class ReportScheduler:
+    """Keeps the aggregates for the current report period and rolls them over.
+
+    add() returns the finished ReportWindow when a sample falls past the end
+    of the current period, otherwise None. Period boundaries follow the sample
+    timestamps, so replayed data rolls over on its own clock.
+
+    Each sample is taken to cover the time since the previous one (CPU usage
+    is measured over exactly that span), including across a period boundary,
+    capped at twice the sampling interval so a stopped monitor or a suspended
+    host doesn't count as time above threshold.
+    """
+
+    def __init__(self, period="daily", interval=60):
+        self.period = period
+        self.window = None
+        self.last_timestamp = None
+        self.set_interval(interval)
+
+    def set_interval(self, interval):
+        self.max_gap = 2.0 * interval
+
+    def set_period(self, period):
+        """Switch period; the next sample starts a window for the new period.
+
+        Returns the current window, closed at its last sample, so the data
+        collected so far can still be reported under its own period, or None.
+        """
+        if period == self.period:
+            return None
+        self.period = period
+        closed, self.window = self.window, None
+        if closed is None or not closed.count:
+            return None
+        closed.end = closed.last_timestamp
+        return closed
+
+    def add(self, sample, memory_threshold, cpu_threshold, track_processes=True):
+        finished = None
+        if self.window is not None and sample.timestamp >= self.window.end:
+            finished = self.window
+            self.window = None
+        if self.window is None:
+            self.window = ReportWindow(self.period, *period_bounds(self.period, sample.timestamp))
+
+        duration = 0.0
+        if self.last_timestamp is not None:
+            duration = min(max(sample.timestamp - self.last_timestamp, 0.0), self.max_gap)
+        self.last_timestamp = sample.timestamp
+        self.window.add(sample, memory_threshold, cpu_threshold, duration)
+        if track_processes:
+            self.window.processes.maybe_sample(sample.timestamp)
+        return finished
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
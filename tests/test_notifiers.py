@@ -0,0 +1,216 @@
+"""Delivery tests for the notification queue against local stand-in endpoints.
+
+A 127.0.0.1 HTTP/1.1 server plays the webhook and a UDP socket plays the
+syslog server, so nothing leaves the machine. Run with python -m pytest
+from the repository root.
+"""
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from monitor_notifiers import (DeliveryError, EmailNotifier, NotificationQueue,
+                               PermanentDeliveryError, SyslogNotifier, WebhookNotifier,
+                               make_notification)
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.client_address, time.monotonic(), json.loads(body)))
+        time.sleep(server.delay)
+        self.send_response(server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, status=200, delay=0.0):
+        super().__init__(("127.0.0.1", 0), WebhookHandler)
+        self.status = status
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []  # (client address, monotonic time, JSON payload)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class SyslogListener:
+    """UDP socket standing in for a remote syslog server"""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(5)
+        self.address = "127.0.0.1:%d" % self.sock.getsockname()[1]
+
+    def receive(self, count):
+        return [self.sock.recv(65536).decode("utf-8") for _ in range(count)]
+
+    def close(self):
+        self.sock.close()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class NotificationQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.results = []  # (notifier name, batch size, error)
+        self.cleanups = []
+
+    def tearDown(self):
+        for cleanup in reversed(self.cleanups):
+            cleanup()
+
+    def make_queue(self, notifiers, **kwargs):
+        notifications = NotificationQueue(
+            notifiers, on_result=lambda notifier, batch, error: self.results.append(
+                (notifier.name, len(batch), error)),
+            **kwargs
+        )
+        self.cleanups.append(notifications.close)
+        return notifications
+
+    def webhook_server(self, **kwargs):
+        server = WebhookServer(**kwargs)
+        self.cleanups.append(server.stop)
+        return server
+
+    def syslog_listener(self):
+        listener = SyslogListener()
+        self.cleanups.append(listener.close)
+        return listener
+
+    def submit_alerts(self, notifications, count):
+        for i in range(count):
+            self.assertTrue(notifications.submit(
+                make_notification("alert", f"ALERT {i}", f"alert body {i}", index=i)))
+
+    def test_batches_share_one_keep_alive_connection(self):
+        server = self.webhook_server()
+        syslog = self.syslog_listener()
+        notifications = self.make_queue([
+            WebhookNotifier(server.url, batch_size=2, batch_interval=0.5),
+            SyslogNotifier(syslog.address, batch_size=2, batch_interval=0.5),
+        ])
+
+        self.submit_alerts(notifications, 5)
+
+        self.assertTrue(wait_for(lambda: len(self.results) == 6))
+        batches = [payload["notifications"] for _, _, payload in server.requests]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([n["index"] for batch in batches for n in batch], [0, 1, 2, 3, 4])
+        self.assertEqual(len({address for address, _, _ in server.requests}), 1)
+
+        messages = syslog.receive(5)
+        self.assertTrue(all(m.startswith("<12>") for m in messages))  # user.warning
+        self.assertEqual([m.rsplit("alert body ", 1)[1] for m in messages], ["0", "1", "2", "3", "4"])
+        self.assertEqual(sorted(size for name, size, _ in self.results if name == "syslog"), [1, 2, 2])
+        self.assertTrue(all(error is None for _, _, error in self.results))
+
+    def test_slow_webhook_does_not_block_syslog(self):
+        server = self.webhook_server(delay=2.0)
+        syslog = self.syslog_listener()
+        notifications = self.make_queue([
+            WebhookNotifier(server.url, batch_size=1, batch_interval=0),
+            SyslogNotifier(syslog.address, batch_size=1, batch_interval=0),
+        ])
+
+        started = time.monotonic()
+        self.submit_alerts(notifications, 2)
+
+        messages = syslog.receive(2)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(wait_for(lambda: len(server.requests) == 1))
+        self.assertEqual([name for name, _, _ in self.results], ["syslog", "syslog"])
+
+    def test_failing_endpoint_is_retried_with_backoff_then_dropped(self):
+        server = self.webhook_server(status=500)
+        notifications = self.make_queue(
+            [WebhookNotifier(server.url, batch_size=1, batch_interval=0)],
+            max_retries=3, backoff=0.1, max_backoff=0.2
+        )
+
+        self.submit_alerts(notifications, 1)
+
+        self.assertTrue(wait_for(lambda: self.results))
+        self.assertEqual(len(server.requests), 4)
+        name, size, error = self.results[0]
+        self.assertEqual((name, size), ("webhook", 1))
+        self.assertIsInstance(error, DeliveryError)
+        self.assertIn("HTTP 500", str(error))
+
+        # Jittered delays of 0.5-1x the backoff, which doubles up to max_backoff
+        times = [when for _, when, _ in server.requests]
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        for gap, backoff in zip(gaps, (0.1, 0.2, 0.2)):
+            self.assertGreaterEqual(gap, backoff * 0.5)
+            self.assertLess(gap, backoff + 0.5)
+
+    def test_unreachable_endpoint_is_dropped_after_retries(self):
+        # A port that was just free, so the connection is refused
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        notifications = self.make_queue(
+            [WebhookNotifier(f"http://127.0.0.1:{port}/hook", batch_size=1, batch_interval=0)],
+            max_retries=2, backoff=0.01, max_backoff=0.02
+        )
+
+        self.submit_alerts(notifications, 1)
+
+        self.assertTrue(wait_for(lambda: self.results))
+        self.assertIsInstance(self.results[0][2], DeliveryError)
+
+    def test_configuration_errors_are_not_retried(self):
+        notifications = self.make_queue(
+            [EmailNotifier("127.0.0.1", 1, "", "", "alerts@example.com",
+                           batch_size=1, batch_interval=0)],
+            max_retries=5, backoff=10.0
+        )
+
+        self.submit_alerts(notifications, 1)
+
+        self.assertTrue(wait_for(lambda: self.results, timeout=1.0))
+        self.assertIsInstance(self.results[0][2], PermanentDeliveryError)
+
+    def test_submit_drops_when_the_queue_is_full(self):
+        notifications = self.make_queue([], max_pending=10)
+        notifications.close()  # stop dispatching so submissions stay queued
+
+        self.assertEqual(sum(notifications.submit(make_notification("alert", "s", "b"))
+                             for _ in range(12)), 10)
+        notifications.max_pending = 12
+        self.assertEqual(sum(notifications.submit(make_notification("alert", "s", "b"))
+                             for _ in range(3)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()